@@ -13,10 +13,11 @@
 from .dataset_class import DataSet
 from .import_data import create_data_subset, import_data
 from .preprocess_data import lemmatize, tokenize_sentence, strip_whitespace, lowercase, remove_punctuation, \
-    remove_stopwords, remove_numbers, create_cleaned_token_embedding, create_cleaned_text, number_punctuations_total, \
-    number_words, number_unique_words, number_punctuation_marks, number_characters, average_characters, number_pos, \
-    number_times, number_stopwords, named_numbers, \
-    load_embeddings, pca_embeddings, word_embeddings, create_translation_dictionary, translate_words, \
-    sentence_embedding_average, tf_idf_vector, sentence_embedding_tf_idf
+    remove_stopwords, remove_numbers, create_cleaned_token_embedding, create_cleaned_text, \
+    number_punctuations_total, number_words, number_unique_words, number_punctuation_marks, punctuation_mark_counts, \
+    number_characters, average_characters, number_pos, \
+    number_times, compute_tag_counts, sentiment, number_stopwords, named_numbers, \
+    load_embeddings, pca_embeddings, embedded_token_list, word_embeddings, create_translation_dictionary, \
+    translate_words, sentence_embedding_average, tf_idf_vector, sentence_embedding_tf_idf
 from .preprocessing_class import PreprocessingEuroParl
 from .utils import get_sentence_pairs
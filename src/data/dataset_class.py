@@ -2,6 +2,7 @@
 retrieval.
 """
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
@@ -65,23 +66,23 @@ class DataSet:
 
         """
 
-        preprocessed_source = self.model_subset[["id_source", embedding_source]]
-        preprocessed_target = self.model_subset[["id_target", embedding_target]]
-
         random_sample_right = self.model_subset[["id_source", "id_target"]]
 
-        multiplied_source = pd.concat([preprocessed_source] * sample_size_k, ignore_index=True).reset_index(
-            drop=True)
-        sample_target = preprocessed_target.sample(n_model * sample_size_k, replace=True, random_state=42).reset_index(
-            drop=True)
-
-        random_sample_wrong = pd.concat([multiplied_source, sample_target], axis=1)
+        # Pair every source sentence with sample_size_k random target sentences by positional gathers instead of
+        # concatenating replicated frames. The sampling matches DataFrame.sample(replace=True, random_state=42).
+        source_positions = np.tile(np.arange(len(self.model_subset)), sample_size_k)
+        target_positions = np.random.RandomState(42).choice(len(self.model_subset), n_model * sample_size_k,
+                                                             replace=True)
+        random_sample_wrong = pd.DataFrame({
+            "id_source": self.model_subset["id_source"].to_numpy()[source_positions],
+            embedding_source: self.model_subset[embedding_source].to_numpy()[source_positions],
+            "id_target": self.model_subset["id_target"].to_numpy()[target_positions],
+            embedding_target: self.model_subset[embedding_target].to_numpy()[target_positions]})
 
         # Select only the 2*k closest sentence embeddings for training to increase the complexity of the task for
         # the supervised classifier.
-        random_sample_wrong["cosine_similarity"] = cosine_similarity_vector(
-            random_sample_wrong["sentence_embedding_tf_idf_proc_5k_source"],
-            random_sample_wrong["sentence_embedding_tf_idf_proc_5k_target"])
+        random_sample_wrong["cosine_similarity"] = cosine_similarity_vector(random_sample_wrong[embedding_source],
+                                                                            random_sample_wrong[embedding_target])
 
         random_sample_k_index = random_sample_wrong.groupby("id_source")['cosine_similarity'].nlargest(k)
 
@@ -1,9 +1,11 @@
 """ Functions to preprocess parallel sentence data.
 """
 
+import itertools
 import pickle
 import re
 import string
+from collections import Counter
 
 import numpy as np
 import pandas as pd
@@ -12,12 +14,22 @@ from sklearn.decomposition import PCA
 from sklearn.feature_extraction.text import TfidfVectorizer
 from tqdm import tqdm
 
+from src.utils.on_unique import on_unique
+from src.utils.parallel import N_PROCESS, parallel_map
 from src.utils.timer import timer
 
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
 tqdm.pandas()
 
+PUNCTUATION = frozenset(string.punctuation)
+
 
 @timer
+@on_unique
 def tokenize_sentence(sentence_vector):
     """ Function to tokenize an array of sentences.
        Args:
@@ -25,7 +37,7 @@ def tokenize_sentence(sentence_vector):
        Returns:
            numpy.array: Array containing the individual tokens of the input sentence.
     """
-    return sentence_vector.progress_apply(lambda sentence: word_tokenize(sentence))
+    return sentence_vector.progress_apply(word_tokenize)
 
 
 @timer
@@ -40,18 +52,24 @@ def strip_whitespace(token_vector):
 
 
 @timer
-def spacy(sentence_vector, nlp_language):
-    """ Function to lemmatize an array of sentences.
+@on_unique
+def spacy(sentence_vector, nlp_language, disable=("parser", "ner")):
+    """ Function to run a spacy pipeline over an array of sentences.
+
+        The sentences are streamed through the pipeline in batches and on multiple processes, so the spacy model is
+        only entered once per batch instead of once per sentence.
 
         Args:
             sentence_vector (array): Array containing text.
             nlp_language (object): Spacy pipeline.
+            disable (tuple): Names of pipeline components that are not needed and therefore skipped.
 
         Returns:
-            numpy.array: Array containing the lemmatized words.
+            numpy.array: Array containing the spacy token of each sentence.
     """
-    lemmatizer_language = nlp_language.get_pipe("lemmatizer")
-    return sentence_vector.progress_apply(lambda sentence: [token for token in nlp_language(sentence)])
+    docs = nlp_language.pipe(sentence_vector.tolist(), batch_size=1000, n_process=N_PROCESS, disable=list(disable))
+    return pd.Series([[token for token in doc] for doc in tqdm(docs, total=len(sentence_vector))],
+                     index=sentence_vector.index, dtype=object)
 
 
 @timer
@@ -65,8 +83,8 @@ def remove_stopwords(token_vector, stopwords_list):
         Returns:
             numpy.array: Array containing tokenized sentence removed stopwords.
     """
-
-    return token_vector.progress_apply(lambda token_list: [word for word in token_list if word not in stopwords_list])
+    stopwords_set = frozenset(stopwords_list)
+    return token_vector.progress_apply(lambda token_list: [word for word in token_list if word not in stopwords_set])
 
 
 @timer
@@ -145,14 +163,16 @@ def create_cleaned_token_embedding(sentence_vector, nlp_language, stopwords_list
     Returns:
         array: Cleaned array as Bag of Words.
     """
+    stopwords_set = frozenset(stopwords_list)
     token_vector_spacy = spacy(sentence_vector, nlp_language)
-    token_vector_punctuation = remove_punctuation(token_vector_spacy)
-    token_vector_numbers = remove_numbers(token_vector_punctuation)
-    sentence_vector_lemmatized = lemmatize(token_vector_numbers)
-    token_vector_preprocessed = lowercase_spacy(sentence_vector_lemmatized)
-    token_vector_stopwords = remove_stopwords(token_vector_preprocessed, stopwords_list)
 
-    return token_vector_stopwords
+    def clean_token_list(token_list):
+        """ Remove punctuation and numbers, lemmatize, lowercase and remove stopwords in a single pass.
+        """
+        lemmas = (token.lemma_.lower() for token in token_list if not token.is_punct and not token.like_num)
+        return [lemma for lemma in lemmas if lemma not in stopwords_set]
+
+    return token_vector_spacy.progress_apply(clean_token_list)
 
 
 @timer
@@ -166,13 +186,16 @@ def create_cleaned_text(sentence_vector, stopwords_list):
     Returns:
         array: Cleaned array as Bag of Word.
     """
+    stopwords_set = frozenset(stopwords_list)
     token_vector = tokenize_sentence(sentence_vector)
-    token_vector_stopwords = remove_stopwords(token_vector, stopwords_list)
-    token_vector_whitespace = strip_whitespace(token_vector_stopwords)
-    token_vector_lowercase = lowercase(token_vector_whitespace)
-    token_vector_stopwords = remove_stopwords(token_vector_lowercase, stopwords_list)
 
-    return token_vector_stopwords
+    def clean_token_list(token_list):
+        """ Strip whitespaces, lowercase and remove stopwords in a single pass.
+        """
+        words = (token.strip().lower() for token in token_list if token not in stopwords_set)
+        return [word for word in words if word not in stopwords_set]
+
+    return token_vector.progress_apply(clean_token_list)
 
 
 @timer
@@ -185,14 +208,12 @@ def number_punctuations_total(sentence_vector):
        Returns:
            array: Array containing the total number of punctuation marks.
     """
-    list_pm = list(string.punctuation)
-
     # Drop the end of sentence points, since it is not an differentiator between two sentences. And the data set may
     # translate two sentences or more into one.
-    list_pm.remove('.')
-    list_pm.append('...')
+    punctuation_marks = (PUNCTUATION - {'.'}) | {'...'}
 
-    return sentence_vector.progress_apply(lambda sentence: len([word for word in sentence if word in list_pm]))
+    return sentence_vector.progress_apply(
+        lambda sentence: len([word for word in sentence if word in punctuation_marks]))
 
 
 @timer
@@ -206,7 +227,7 @@ def number_words(sentence_vector):
            array: Array containing the total number of words.
        """
     return sentence_vector.progress_apply(
-        lambda sentence: len([word for word in sentence if word not in string.punctuation]))
+        lambda sentence: len([word for word in sentence if word not in PUNCTUATION]))
 
 
 @timer
@@ -220,7 +241,7 @@ def number_unique_words(sentence_vector):
            array: Array containing the total number of unique words.
        """
     return sentence_vector.progress_apply(
-        lambda sentence: len(np.unique([word for word in sentence if word not in string.punctuation])))
+        lambda sentence: len({word for word in sentence if word not in PUNCTUATION}))
 
 
 @timer
@@ -234,7 +255,34 @@ def number_punctuation_marks(sentence_vector, punctuation_mark):
        Returns:
            array: Array containing the total number of this punctuation mark.
        """
-    return sentence_vector.progress_apply(lambda sentence: len([word for word in sentence if word == punctuation_mark]))
+    return punctuation_mark_counts(sentence_vector, [punctuation_mark])[punctuation_mark]
+
+
+@timer
+def punctuation_mark_counts(sentence_vector, punctuation_list):
+    """ Function to generate the number of every given punctuation mark in a given vector of Bag of Words-Sentences.
+
+       The token lists are flattened into one contiguous token array plus the row of every token, the layout of an
+       Arrow list array, so that all punctuation marks of all sentences are counted by a few vectorized kernels.
+
+       Args:
+           sentence_vector (array): Bag of Words array.
+           punctuation_list (list): Punctuation marks of interest.
+
+       Returns:
+           pandas.DataFrame: Dataframe containing the total number of each punctuation mark, one column per mark.
+       """
+    n_sentences = len(sentence_vector)
+    n_marks = len(punctuation_list)
+    lengths = np.fromiter(map(len, sentence_vector), dtype=np.int64, count=n_sentences)
+    tokens = np.array(list(itertools.chain.from_iterable(sentence_vector)), dtype=object)
+    rows = np.repeat(np.arange(n_sentences), lengths)
+
+    codes = pd.Index(punctuation_list).get_indexer(tokens)
+    is_mark = codes >= 0
+    counts = np.bincount(rows[is_mark] * n_marks + codes[is_mark], minlength=n_sentences * n_marks)
+
+    return pd.DataFrame(counts.reshape(n_sentences, n_marks), index=sentence_vector.index, columns=punctuation_list)
 
 
 @timer
@@ -248,7 +296,7 @@ def number_characters(sentence_vector):
            array: Array containing the total number of characters.
        """
     return sentence_vector.progress_apply(lambda sentence:
-                                          np.sum([len(word) for word in sentence if word not in string.punctuation]))
+                                          sum([len(word) for word in sentence if word not in PUNCTUATION]))
 
 
 @timer
@@ -262,7 +310,10 @@ def average_characters(character_vector, word_vector):
        Returns:
            numpy.array: Array containing the average amount of characters per word.
        """
-    return (character_vector / word_vector).replace(np.nan, 0).replace(np.inf, 0).replace(np.log(0), 0)
+    characters = character_vector.to_numpy(dtype=float)
+    words = word_vector.to_numpy(dtype=float)
+    average = np.divide(characters, words, out=np.zeros_like(characters), where=words != 0)
+    return pd.Series(average, index=character_vector.index)
 
 
 @timer
@@ -294,37 +345,66 @@ def number_times(sentence_vector, tense):
 
     """
     return sentence_vector.progress_apply(
-        lambda sentence: len([token for token in sentence if token.morph.get(
-            "Tense") == tense]))
+        lambda sentence: len([token for token in sentence if (token.morph.get("Tense") or [""])[0] == tense]))
 
 
-# @timer
-# def polarity(sentence_vector, textblob_language):
-#     """ Function to generate the polarity in a given vector of Bag of Words-sentences.
-#
-#        Args:
-#            sentence_vector (array): Bag of Words array.
-#            textblob_language (str): Language of the array.
-#
-#        Returns:
-#            array: Array containing the polarity (sentiment analyses).
-#        """
-#     return sentence_vector.progress_apply(lambda sentence: textblob_language(sentence).sentiment.polarity)
-#
-#
-# @timer
-# def subjectivity(sentence_vector, textblob_language):
-#     """ Function to generate the subjectivity in a given vector of Bag of Words-sentences.
-#
-#         Args:
-#             sentence_vector (array): Bag of Words array.
-#             textblob_language (str): Language of the array.
-#
-#         Returns:
-#             array: Array containing the subjectivity (sentiment analyses).
-#
-#         """
-#     return sentence_vector.progress_apply(lambda sentence: textblob_language(sentence).sentiment.subjectivity)
+@timer
+@on_unique
+def compute_tag_counts(sentence_vector, nlp_language, pos_list, tense_list):
+    """ Function to count part-of-speech and verb tense tags of an array of sentences in a single spacy pass.
+
+    Args:
+           sentence_vector (array): Array containing text.
+           nlp_language (object): Spacy pipeline.
+           pos_list (list): Part-of-speech tags to count.
+           tense_list (list): Verb tense tags to count, an empty string counts token without tense.
+
+    Returns:
+           pandas.DataFrame: Dataframe containing the number of token per part-of-speech tag.
+           pandas.DataFrame: Dataframe containing the number of token per verb tense tag.
+    """
+    pos_counts = []
+    tense_counts = []
+    docs = nlp_language.pipe(sentence_vector.tolist(), batch_size=500, n_process=N_PROCESS,
+                             disable=["parser", "ner", "lemmatizer"])
+    for doc in tqdm(docs, total=len(sentence_vector)):
+        pos_counts.append(Counter(token.pos_ for token in doc))
+        tense_counts.append(Counter((token.morph.get("Tense") or [""])[0] for token in doc))
+
+    pos_dataframe = pd.DataFrame(pos_counts, index=sentence_vector.index, columns=pos_list).fillna(0).astype(int)
+    tense_dataframe = pd.DataFrame(tense_counts, index=sentence_vector.index, columns=tense_list).fillna(0).astype(int)
+    return pos_dataframe, tense_dataframe
+
+
+def textblob_sentiment(sentence, textblob_language):
+    """ Function to analyse the sentiment of a single sentence.
+
+       Args:
+           sentence (str): Sentence to analyse.
+           textblob_language (object): TextBlob class of the language of the sentence.
+
+       Returns:
+           tuple: Polarity and subjectivity of the sentence.
+       """
+    return tuple(textblob_language(sentence).sentiment)
+
+
+@timer
+@on_unique
+def sentiment(sentence_vector, textblob_language):
+    """ Function to generate the polarity and subjectivity in a given vector of sentences from one sentiment analysis
+        per sentence.
+
+       Args:
+           sentence_vector (array): Array containing text.
+           textblob_language (object): TextBlob class of the language of the array.
+
+       Returns:
+           pandas.DataFrame: Dataframe containing the polarity and subjectivity (sentiment analyses).
+       """
+    sentiments = parallel_map(textblob_sentiment, sentence_vector, itertools.repeat(textblob_language),
+                              n_process=N_PROCESS)
+    return pd.DataFrame(sentiments, index=sentence_vector.index, columns=["polarity", "subjectivity"])
 
 
 @timer
@@ -339,8 +419,9 @@ def number_stopwords(sentence_vector, stopwords_language):
             array: Array containing the total number of stopwords in a given language.
 
         """
+    stopwords_set = frozenset(stopwords_language)
     return sentence_vector.progress_apply(
-        lambda sentence: len([word for word in sentence if word in stopwords_language]))
+        lambda sentence: len([word for word in sentence if word in stopwords_set]))
 
 
 # def named_entities(sentence_vector, nlp_language):
@@ -373,12 +454,14 @@ def named_numbers(token_vector):
 
 @timer
 def load_embeddings(embedding_array_path,
-                    embedding_dictionary_path):
+                    embedding_dictionary_path,
+                    dtype=np.float32):
     """ Function to load embeddings.
 
     Args:
         embedding_array_path (string): Path to the array of embeddings.
         embedding_dictionary_path (string): Path to the dictionary matching words to embeddings.
+        dtype (numpy.dtype): Data type of the returned embeddings, numpy.float16 halves the memory of the array.
 
     Returns:
         array: Array containing normalized embeddings
@@ -392,15 +475,15 @@ def load_embeddings(embedding_array_path,
     def normalize_array(array):
         """ Function to normalize embeddings.
         """
-        norms = np.sqrt(np.sum(np.square(array), axis=1))
+        norms = np.linalg.norm(array, axis=1, keepdims=True)
         norms[norms == 0] = 1
-        norms = norms.reshape(-1, 1)
-        array /= norms[:]
+        array /= norms
         return array
 
-    embedding_array_normalized = normalize_array(np.vstack(embedding_array))
+    # Normalize in place on a contiguous float32 copy to avoid upcasting the largest array of the pipeline.
+    embedding_array_normalized = normalize_array(np.ascontiguousarray(np.vstack(embedding_array), dtype=np.float32))
 
-    return embedding_array_normalized, embedding_dictionary
+    return embedding_array_normalized.astype(dtype, copy=False), embedding_dictionary
 
 
 @timer
@@ -414,11 +497,25 @@ def pca_embeddings(embedding_array_normalized, k=10):
     Returns:
         array: Array containing principal components of the embeddings
     """
-    pca = PCA(n_components=k)
-    principal_components = pca.fit_transform(embedding_array_normalized)
+    # Only a few components are needed, so a randomized SVD on float32 input is much cheaper than the full SVD.
+    pca = PCA(n_components=k, svd_solver='randomized', random_state=0)
+    principal_components = pca.fit_transform(np.asarray(embedding_array_normalized, dtype=np.float32))
     return np.asarray(principal_components)
 
 
+def embedded_token_list(token_list, embedding_dictionary):
+    """ Function to list the unique token of a sentence that have an embedding, in order of appearance.
+
+       Args:
+           token_list (list): List of preprocessed token.
+           embedding_dictionary (dictionary): Dictionary matching words to embeddings.
+
+       Returns:
+           list: Unique token contained in the embedding dictionary.
+       """
+    return [token for token in dict.fromkeys(token_list) if token in embedding_dictionary]
+
+
 @timer
 def word_embeddings(token_vector, embedding_array, embedding_dictionary):
     """ Function to create embeddings for the preprocessed words.
@@ -429,19 +526,18 @@ def word_embeddings(token_vector, embedding_array, embedding_dictionary):
            embedding_dictionary (dictionary): Dictionary matching words to embeddings.
 
        Returns:
-           pandas.Dataframe: Array containing arrays of the embeddings.
+           array: Array containing one (token, float32 embedding matrix) pair per sentence, where row i of the matrix
+                  is the embedding of the i-th token of embedded_token_list.
        """
 
     def token_list_embedding(embedding_array, embedding_dictionary, token_list):
-        """ Function to retrieve the embeddings from the array.
+        """ Function to gather the embeddings from the array.
         """
-        word_embedding_dictionary = {}
-        for i in range(len(token_list)):
-            if embedding_dictionary.get(token_list[i]):
-                word_embedding_dictionary[token_list[i]] = embedding_array[
-                    embedding_dictionary.get(token_list[i])].tolist()
-        embedding_dataframe = pd.DataFrame(word_embedding_dictionary)
-        return embedding_dataframe
+        embedded_token = embedded_token_list(token_list, embedding_dictionary)
+        embedding_index = [embedding_dictionary[token] for token in embedded_token]
+        embedding_matrix = embedding_array[np.asarray(embedding_index, dtype=np.int64)]
+        # Upcast the few gathered rows, so that float16 storage does not lower the precision of sentence embeddings.
+        return embedded_token, embedding_matrix.astype(np.float32, copy=False)
 
     return token_vector.progress_apply(lambda token_list: token_list_embedding(embedding_array, embedding_dictionary,
                                                                                token_list))
@@ -465,56 +561,58 @@ def create_translation_dictionary(token_vector_source, token_vector_target,
           dict: Translation Dictionary form source to target.
           dict: Translation Dictionary form target to source.
     """
-    unique_token_source = set([item for sublist in token_vector_source for item in sublist])
-    unique_token_target = set([item for sublist in token_vector_target for item in sublist])
+    # Embeddings stored in float16 are searched with a float16 index, this is lossless as they hold float16 values.
+    float16_source = embedding_array_normalized_source.dtype == np.float16
+    float16_target = embedding_array_normalized_target.dtype == np.float16
+
+    unique_token_source = set(itertools.chain.from_iterable(token_vector_source))
+    unique_token_target = set(itertools.chain.from_iterable(token_vector_target))
 
     def create_dictionary(unique_token, embedding_dictionary, embedding_array_normalized):
-        """ Create reduced dictionary and embedding array for translation search.
+        """ Create reduced dictionary and embedding array for translation search with a single gather.
         """
-        index = 0
-        word_embedding_dictionary = {}
-        embedding_subset_dictionary = {}
-        for token in unique_token:
-            if embedding_dictionary.get(token):
-                word_embedding_dictionary[token] = embedding_array_normalized[
-                    embedding_dictionary.get(token)].tolist()
-                embedding_subset_dictionary[index] = token
-                index += 1
-        return word_embedding_dictionary, embedding_subset_dictionary
-
-    word_embedding_dictionary_source, embedding_subset_dictionary_source = create_dictionary(unique_token_source,
-                                                                                             embedding_dictionary_source,
-                                                                                             embedding_array_normalized_source)
-
-    word_embedding_dictionary_target, embedding_subset_dictionary_target = create_dictionary(unique_token_target,
-                                                                                             embedding_dictionary_target,
-                                                                                             embedding_array_normalized_target)
-
-    embedding_subset_source = np.array(list(word_embedding_dictionary_source.values()))
-    embedding_subset_target = np.array(list(word_embedding_dictionary_target.values()))
-
-    def translation(token, word_embedding_dictionary_source, embedding_subset_target,
-                    embedding_subset_dictionary_target):
-        """ Find translations in the other language and return.
+        token_kept = [token for token in unique_token if token in embedding_dictionary]
+        embedding_index = np.asarray([embedding_dictionary[token] for token in token_kept], dtype=np.int64)
+        embedding_subset = np.ascontiguousarray(embedding_array_normalized[embedding_index], dtype=np.float32)
+        return embedding_subset, dict(enumerate(token_kept))
+
+    embedding_subset_source, embedding_subset_dictionary_source = create_dictionary(unique_token_source,
+                                                                                    embedding_dictionary_source,
+                                                                                    embedding_array_normalized_source)
+
+    embedding_subset_target, embedding_subset_dictionary_target = create_dictionary(unique_token_target,
+                                                                                    embedding_dictionary_target,
+                                                                                    embedding_array_normalized_target)
+
+    def translation(embedding_subset_source, embedding_subset_target, embedding_subset_dictionary_source,
+                    embedding_subset_dictionary_target, float16_target, batch_size=4096):
+        """ Find translations in the other language for all words of the subset. Uses a faiss inner product index if
+        faiss is installed and one matrix product per batch otherwise. Both search the same embedding values, so both
+        return the same translations.
         """
-        norm_src_word_emb = word_embedding_dictionary_source[token]
-        similarity_cos = np.dot(norm_src_word_emb, np.transpose(embedding_subset_target))
-        most_similar_trg_index = np.argsort(-similarity_cos)[0].tolist()
-        return embedding_subset_dictionary_target[most_similar_trg_index]
-
-    translation_to_target_source = {}
-    for token in unique_token_source:
-        if embedding_dictionary_source.get(token):
-            translation_to_target_source[token] = translation(token, word_embedding_dictionary_source,
-                                                              embedding_subset_target,
-                                                              embedding_subset_dictionary_target)
-
-    translation_to_source_target = {}
-    for token in unique_token_target:
-        if embedding_dictionary_target.get(token):
-            translation_to_source_target[token] = translation(token, word_embedding_dictionary_target,
-                                                              embedding_subset_source,
-                                                              embedding_subset_dictionary_source)
+        if faiss is not None:
+            if float16_target:
+                index = faiss.IndexScalarQuantizer(embedding_subset_target.shape[1], faiss.ScalarQuantizer.QT_fp16,
+                                                   faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexFlatIP(embedding_subset_target.shape[1])
+            index.add(embedding_subset_target)
+            most_similar_trg_index = index.search(embedding_subset_source, 1)[1][:, 0]
+        else:
+            most_similar_trg_index = np.empty(embedding_subset_source.shape[0], dtype=np.int64)
+            for start in range(0, embedding_subset_source.shape[0], batch_size):
+                similarity_cos = np.dot(embedding_subset_source[start:start + batch_size], embedding_subset_target.T)
+                most_similar_trg_index[start:start + batch_size] = np.argmax(similarity_cos, axis=1)
+
+        return {embedding_subset_dictionary_source[src_index]: embedding_subset_dictionary_target[trg_index]
+                for src_index, trg_index in enumerate(most_similar_trg_index.tolist())}
+
+    translation_to_target_source = translation(embedding_subset_source, embedding_subset_target,
+                                               embedding_subset_dictionary_source, embedding_subset_dictionary_target,
+                                               float16_target)
+    translation_to_source_target = translation(embedding_subset_target, embedding_subset_source,
+                                               embedding_subset_dictionary_target, embedding_subset_dictionary_source,
+                                               float16_source)
 
     return translation_to_target_source, translation_to_source_target
 
@@ -550,12 +648,22 @@ def sentence_embedding_average(embedding_token_vector):
     """ Function to create average sentence embedding.
 
        Args:
-           embedding_token_vector (array): Array containing embedding array of the token.
+           embedding_token_vector (array): Array containing the (token, embedding matrix) pair of each sentence, see
+                                           word_embeddings.
 
        Returns:
            array: Array containing average of the embeddings.
     """
-    return embedding_token_vector.progress_apply(lambda embedding_token: [embedding_token.mean(axis=1)])
+
+    def average_embedding(embedding_token):
+        """ Calculate the mean of the word embeddings for one sentence.
+        """
+        _, embedding_matrix = embedding_token
+        if not embedding_matrix.shape[0]:
+            return [pd.Series(dtype=embedding_matrix.dtype)]
+        return [pd.Series(embedding_matrix.mean(axis=0))]
+
+    return embedding_token_vector.progress_apply(average_embedding)
 
 
 @timer
@@ -575,48 +683,47 @@ def tf_idf_vector(token_vector):
 
     vectorizer = TfidfVectorizer(tokenizer=identity_tokenizer, lowercase=False)
     tf_idf_matrix = vectorizer.fit_transform(token_vector)
-    token_names = vectorizer.get_feature_names()
-    tf_idf_dict = {}
-    j = 0
-    for name in token_names:
-        tf_idf_dict[name] = j
-        j += 1
+    token_names = np.array(vectorizer.get_feature_names(), dtype=object)
 
+    # Read the weights of each sentence straight from its slice of the CSR arrays instead of indexing single
+    # matrix elements.
     tf_idf_list = []
-    for i in tqdm(range(len(token_vector))):
-        tf_idf_token = {}
-        for token in token_vector[i]:
-            tf_idf_token[token] = tf_idf_matrix[i, tf_idf_dict[token]]
-        tf_idf_list.append(tf_idf_token)
+    for i in tqdm(range(tf_idf_matrix.shape[0])):
+        row = slice(tf_idf_matrix.indptr[i], tf_idf_matrix.indptr[i + 1])
+        tf_idf_list.append(dict(zip(token_names[tf_idf_matrix.indices[row]], tf_idf_matrix.data[row])))
     tf_idf_vec = np.array(tf_idf_list)
     return tf_idf_vec
 
 
 @timer
-def sentence_embedding_tf_idf(embedding_array_dataframe_vec, tf_idf_dict_vec):
+def sentence_embedding_tf_idf(embedding_token_vector, tf_idf_dict_vec):
     """ Function to create tf-idf weighted sentence embeddings.
 
         Args:
-            embedding_array_dataframe_vec (array): Array containing dataframes containing embeddings for each word in a
-                                               sentence.
-            tf_idf_dict_vec (dictionary): Path to the embedding dictionary.
+            embedding_token_vector (array): Array containing the (token, embedding matrix) pair of each sentence, see
+                                            word_embeddings.
+            tf_idf_dict_vec (array): Array of dictionaries for tf-idf weights.
 
         Returns:
             array: Array containing a tf-idf weighted sentence embedding.
         """
     df = pd.DataFrame()
-    df['embedding_array_vec'] = embedding_array_dataframe_vec
+    df['embedding_token_vec'] = embedding_token_vector
     df['tf_idf_dict_vec'] = tf_idf_dict_vec
 
-    def aggregate_tf_idf_embedding(embedding_dataframe, tf_idf_dict):
-        """ Calculate tf-idf mean of word embeddings for one sentence.
+    def aggregate_tf_idf_embedding(embedding_token, tf_idf_dict):
+        """ Calculate tf-idf mean of word embeddings for one sentence as a single matrix-vector product.
         """
-        for i in range(embedding_dataframe.shape[1]):
-            embedding_dataframe[embedding_dataframe.columns[i]] = embedding_dataframe[embedding_dataframe.columns[i]] * \
-                                                                  tf_idf_dict[embedding_dataframe.columns[i]]
-        return [pd.Series(embedding_dataframe.values.mean(axis=1))]
-
-    weighted_average = df.progress_apply(lambda x: aggregate_tf_idf_embedding(x.embedding_array_vec, x.tf_idf_dict_vec),
+        token_list, embedding_matrix = embedding_token
+        if not embedding_matrix.shape[0]:
+            return [pd.Series(dtype=embedding_matrix.dtype)]
+        tf_idf_weights = np.array([tf_idf_dict[token] for token in token_list], dtype=np.float32)
+        return [pd.Series(tf_idf_weights.dot(embedding_matrix) / embedding_matrix.shape[0])]
+
+    # Kept serial: the weighted sum of a sentence is a single small matrix-vector product, which is cheaper than
+    # pickling its (token, embedding matrix) pair to a worker process and the result back.
+    weighted_average = df.progress_apply(lambda x: aggregate_tf_idf_embedding(x.embedding_token_vec,
+                                                                              x.tf_idf_dict_vec),
                                          axis=1)
 
     return weighted_average
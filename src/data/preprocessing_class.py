@@ -7,11 +7,10 @@ import pandas as pd
 
 from src.data.import_data import import_data
 from src.data.preprocess_data import create_cleaned_text, number_punctuations_total, number_words, \
-    number_unique_words, number_punctuation_marks, number_characters, word_embeddings, \
+    number_unique_words, punctuation_mark_counts, number_characters, word_embeddings, \
     average_characters, load_embeddings, \
     translate_words, create_cleaned_token_embedding, tf_idf_vector, sentence_embedding_average, \
-    sentence_embedding_tf_idf, named_numbers, create_translation_dictionary, number_pos, number_times, \
-    spacy
+    sentence_embedding_tf_idf, named_numbers, create_translation_dictionary, compute_tag_counts
 
 
 class PreprocessingEuroParl:
@@ -93,38 +92,39 @@ class PreprocessingEuroParl:
             self.preprocessed["number_characters_target"],
             self.preprocessed["number_words_target"])
 
+        punctuation_source = punctuation_mark_counts(self.dataframe["text_preprocessed_source"],
+                                                     self.punctuation_list)
+        punctuation_target = punctuation_mark_counts(self.dataframe["text_preprocessed_target"],
+                                                     self.punctuation_list)
+
         for punctuation_mark in self.punctuation_list:
-            self.preprocessed[f"number_{punctuation_mark}_source"] = number_punctuation_marks(self.dataframe[
-                                                                                                  "text_preprocessed_source"],
-                                                                                              punctuation_mark)
-            self.preprocessed[f"number_{punctuation_mark}_target"] = number_punctuation_marks(self.dataframe[
-                                                                                                  "text_preprocessed_target"],
-                                                                                              punctuation_mark)
+            self.preprocessed[f"number_{punctuation_mark}_source"] = punctuation_source[punctuation_mark]
+            self.preprocessed[f"number_{punctuation_mark}_target"] = punctuation_target[punctuation_mark]
 
-        self.dataframe["text_source_spacy"] = spacy(self.dataframe["text_source"], nlp_source)
-        self.dataframe["text_target_spacy"] = spacy(self.dataframe["text_target"], nlp_target)
+        pos_source, tense_source = compute_tag_counts(self.dataframe["text_source"], nlp_source, self.pos_list,
+                                                      self.tense_list)
+        pos_target, tense_target = compute_tag_counts(self.dataframe["text_target"], nlp_target, self.pos_list,
+                                                      self.tense_list)
 
         for pos in self.pos_list:
-            self.preprocessed[f"number_{pos}_source"] = number_pos(self.dataframe["text_source_spacy"],
-                                                                   pos)
-            self.preprocessed[f"number_{pos}_target"] = number_pos(self.dataframe["text_target_spacy"],
-                                                                   pos)
+            self.preprocessed[f"number_{pos}_source"] = pos_source[pos]
+            self.preprocessed[f"number_{pos}_target"] = pos_target[pos]
 
         for tense in self.tense_list:
-            self.preprocessed[f"number_{tense}_source"] = number_times(self.dataframe["text_source_spacy"],
-                                                                       tense)
-            self.preprocessed[f"number_{tense}_target"] = number_times(self.dataframe["text_target_spacy"],
-                                                                       tense)
+            self.preprocessed[f"number_{tense}_source"] = tense_source[tense]
+            self.preprocessed[f"number_{tense}_target"] = tense_target[tense]
 
         self.preprocessed["list_named_numbers_source"] = named_numbers(self.dataframe["text_source"])
         self.preprocessed["list_named_numbers_target"] = named_numbers(self.dataframe["text_target"])
 
-    def create_embedding_information(self, embedding, language_pair="en_de"):
+    def create_embedding_information(self, embedding, language_pair="en_de", embedding_dtype=np.float32):
         """ Create information based on embeddings.
 
             Args:
                 language_pair:
                 embedding (str): Type of embedding to create information.
+                embedding_dtype (numpy.dtype): Data type the embeddings are stored in, numpy.float16 halves their
+                                               memory and stores the translation index in float16.
 
         """
         embedding_array_source_path = "../data/interim/" + language_pair + "_" + embedding + "_src_emb.pkl"
@@ -133,9 +133,9 @@ class PreprocessingEuroParl:
         embedding_dictionary_target_path = "../data/interim/" + language_pair + "_" + embedding + "_trg_word.pkl"
 
         embedding_array_normalized_source, embedding_dictionary_source = load_embeddings(
-            embedding_array_source_path, embedding_dictionary_source_path)
+            embedding_array_source_path, embedding_dictionary_source_path, dtype=embedding_dtype)
         embedding_array_normalized_target, embedding_dictionary_target = load_embeddings(
-            embedding_array_target_path, embedding_dictionary_target_path)
+            embedding_array_target_path, embedding_dictionary_target_path, dtype=embedding_dtype)
 
         self.dataframe[f"word_embedding_{embedding}_source"] = word_embeddings(
             self.preprocessed["token_preprocessed_embedding_source"],
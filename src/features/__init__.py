@@ -11,4 +11,5 @@ from .embedding_features import cosine_similarity_vector, euclidean_distance_vec
     jaccard, \
     embedding_difference
 from .feature_generation_class import FeatureGeneration
-from .sentence_features import difference_numerical, relative_difference_numerical, normalized_difference_numerical
+from .sentence_features import difference_numerical, relative_difference_numerical, normalized_difference_numerical, \
+    difference_features
@@ -8,10 +8,32 @@ from tqdm import tqdm
 from wmd import WMD
 
 from src.data.preprocess_data import timer
+from src.utils.parallel import N_PROCESS, parallel_map
 
 tqdm.pandas()
 
 
+def cosine_similarity_pairwise(sentence_embedding_source, sentence_embedding_target):
+    """ Calculate cosine similarity between two arrays.
+    """
+    try:
+        sentence_embedding_source_array = np.array(list(sentence_embedding_source[0].values())).reshape(1, -1)
+        sentence_embedding_target_array = np.array(list(sentence_embedding_target[0].values())).reshape(1, -1)
+        try:
+            return cosine_similarity(X=sentence_embedding_source_array, Y=sentence_embedding_target_array,
+                                     dense_output=True)[0][0]
+        except ValueError:
+            return 0
+    except TypeError:
+        sentence_embedding_source_array = np.array(sentence_embedding_source).reshape(1, -1)
+        sentence_embedding_target_array = np.array(sentence_embedding_target).reshape(1, -1)
+        try:
+            return cosine_similarity(X=sentence_embedding_source_array, Y=sentence_embedding_target_array,
+                                     dense_output=True)[0][0]
+        except ValueError:
+            return 0
+
+
 @timer
 def cosine_similarity_vector(sentence_embedding_source_vector, sentence_embedding_target_vector):
     """ Calculate cosine similarity of sentece embeddings.
@@ -26,33 +48,32 @@ def cosine_similarity_vector(sentence_embedding_source_vector, sentence_embeddin
     df['sentence_embedding_source'] = sentence_embedding_source_vector
     df['sentence_embedding_target'] = sentence_embedding_target_vector
 
-    def cosine_similarity_pairwise(sentence_embedding_source, sentence_embedding_target):
-        """ Calculate cosine similarity between two arrays.
-        """
-        try:
-            sentence_embedding_source_array = np.array(list(sentence_embedding_source[0].values())).reshape(1, -1)
-            sentence_embedding_target_array = np.array(list(sentence_embedding_target[0].values())).reshape(1, -1)
-            try:
-                return cosine_similarity(X=sentence_embedding_source_array, Y=sentence_embedding_target_array,
-                                         dense_output=True)[0][0]
-            except ValueError:
-                return 0
-        except TypeError:
-            sentence_embedding_source_array = np.array(sentence_embedding_source).reshape(1, -1)
-            sentence_embedding_target_array = np.array(sentence_embedding_target).reshape(1, -1)
-            try:
-                return cosine_similarity(X=sentence_embedding_source_array, Y=sentence_embedding_target_array,
-                                         dense_output=True)[0][0]
-            except ValueError:
-                return 0
-
-    cosine_similarity_score = df.progress_apply(lambda x: cosine_similarity_pairwise(x.sentence_embedding_source,
-                                                                                     x.sentence_embedding_target),
-                                                axis=1)
+    cosine_similarity_score = pd.Series(parallel_map(cosine_similarity_pairwise, df['sentence_embedding_source'],
+                                                     df['sentence_embedding_target'], n_process=N_PROCESS),
+                                        index=df.index, dtype=float)
 
     return cosine_similarity_score
 
 
+def euclidean_distance_pairwise(sentence_embedding_source, sentence_embedding_target):
+    """ Calculate euclidean distance between two arrays.
+    """
+    try:
+        sentence_embedding_source_array = np.array(list(sentence_embedding_source[0].values())).reshape(1, -1)
+        sentence_embedding_target_array = np.array(list(sentence_embedding_target[0].values())).reshape(1, -1)
+        try:
+            return euclidean_distances(X=sentence_embedding_source_array, Y=sentence_embedding_target_array)[0][0]
+        except ValueError:
+            return 0
+    except TypeError:
+        sentence_embedding_source_array = np.array(sentence_embedding_source).reshape(1, -1)
+        sentence_embedding_target_array = np.array(sentence_embedding_target).reshape(1, -1)
+        try:
+            return euclidean_distances(X=sentence_embedding_source_array, Y=sentence_embedding_target_array)[0][0]
+        except ValueError:
+            return 0
+
+
 @timer
 def euclidean_distance_vector(sentence_embedding_source_vector, sentence_embedding_target_vector):
     """ Calculate euclidean distance of sentece embeddings.
@@ -69,31 +90,40 @@ def euclidean_distance_vector(sentence_embedding_source_vector, sentence_embeddi
     df['sentence_embedding_source'] = sentence_embedding_source_vector
     df['sentence_embedding_target'] = sentence_embedding_target_vector
 
-    def euclidean_distance_pairwise(sentence_embedding_source, sentence_embedding_target):
-        """ Calculate euclidean distance between two arrays.
-        """
-        try:
-            sentence_embedding_source_array = np.array(list(sentence_embedding_source[0].values())).reshape(1, -1)
-            sentence_embedding_target_array = np.array(list(sentence_embedding_target[0].values())).reshape(1, -1)
-            try:
-                return euclidean_distances(X=sentence_embedding_source_array, Y=sentence_embedding_target_array)[0][0]
-            except ValueError:
-                return 0
-        except TypeError:
-            sentence_embedding_source_array = np.array(sentence_embedding_source).reshape(1, -1)
-            sentence_embedding_target_array = np.array(sentence_embedding_target).reshape(1, -1)
-            try:
-                return euclidean_distances(X=sentence_embedding_source_array, Y=sentence_embedding_target_array)[0][0]
-            except ValueError:
-                return 0
-
-    euclidean_distance_score = df.progress_apply(lambda x: euclidean_distance_pairwise(x.sentence_embedding_source,
-                                                                                       x.sentence_embedding_target),
-                                                 axis=1)
+    euclidean_distance_score = pd.Series(parallel_map(euclidean_distance_pairwise, df['sentence_embedding_source'],
+                                                      df['sentence_embedding_target'], n_process=N_PROCESS),
+                                         index=df.index, dtype=float)
 
     return euclidean_distance_score
 
 
+def word_mover_distance(word_embedding_dict_source, word_embedding_dict_target):
+    """ Calculate word mover distance between two (token, embedding matrix) pairs.
+    """
+    try:
+        source = np.array(word_embedding_dict_source[1], dtype=np.float32)
+        target = np.array(word_embedding_dict_target[1], np.float32)
+        embeddings = np.concatenate((source, target))
+
+        source_len = source.shape[0]
+        target_len = target.shape[0]
+
+        source_words = np.array([i for i in range(source_len)], dtype=np.int32)
+        target_words = np.array([source_len + i for i in range(target_len)], dtype=np.int32)
+
+        source_weights = np.array([1 for i in range(source_len)], dtype=np.int32)
+        target_weights = np.array([1 for i in range(target_len)], dtype=np.int32)
+
+        nbow = {"source": ("source", source_words, source_weights),
+                "target": ("target", target_words, target_weights)}
+        calc = WMD(embeddings, nbow, vocabulary_min=2)
+
+        return calc.nearest_neighbors("source", 1)[0][1]
+
+    except (ValueError, IndexError):
+        return 0
+
+
 @timer
 def word_mover_distance_vector(word_embedding_source_vector, word_embedding_target_vector):
     """ Calculate word mover distance between word embeddings of two sentences.
@@ -108,35 +138,9 @@ def word_mover_distance_vector(word_embedding_source_vector, word_embedding_targ
     df['word_embedding_source'] = word_embedding_source_vector
     df['word_embedding_target'] = word_embedding_target_vector
 
-    def word_mover_distance(word_embedding_dict_source, word_embedding_dict_target):
-        """ Calculate euclidean distance between two dictionaries of arrays.
-        """
-        try:
-            source = np.array(word_embedding_dict_source, dtype=np.float32)
-            target = np.array(word_embedding_dict_target, np.float32)
-            embeddings = np.concatenate((source, target))
-
-            source_len = source.shape[0]
-            target_len = target.shape[0]
-
-            source_words = np.array([i for i in range(source_len)], dtype=np.int32)
-            target_words = np.array([source_len + i for i in range(target_len)], dtype=np.int32)
-
-            source_weights = np.array([1 for i in range(source_len)], dtype=np.int32)
-            target_weights = np.array([1 for i in range(target_len)], dtype=np.int32)
-
-            nbow = {"source": ("source", source_words, source_weights),
-                    "target": ("target", target_words, target_weights)}
-            calc = WMD(embeddings, nbow, vocabulary_min=2)
-
-            return calc.nearest_neighbors("source", 1)[0][1]
-
-        except (ValueError, IndexError):
-            return 0
-
-    word_mover_distance_score = df.progress_apply(lambda x: word_mover_distance(x.word_embedding_source,
-                                                                                x.word_embedding_target),
-                                                  axis=1)
+    word_mover_distance_score = pd.Series(parallel_map(word_mover_distance, df['word_embedding_source'],
+                                                       df['word_embedding_target'], n_process=N_PROCESS),
+                                          index=df.index, dtype=float)
 
     return word_mover_distance_score
 
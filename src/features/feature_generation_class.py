@@ -1,11 +1,11 @@
 """ Class for creating features from preprocessed data.
 """
 
+import numpy as np
 import pandas as pd
 
 from src.features.embedding_features import cosine_similarity_vector, jaccard, euclidean_distance_vector
-from src.features.sentence_features import difference_numerical, relative_difference_numerical, \
-    normalized_difference_numerical
+from src.features.sentence_features import difference_features
 from src.utils import timer
 
 
@@ -64,17 +64,26 @@ class FeatureGeneration:
         """ Create sentence based features.
         """
 
-        for feature in self.feature_difference_list:
-            self.feature_dataframe[f"{feature}_difference"] = difference_numerical(
-                self.preprocessed_dataset[f"{feature}_source"], self.preprocessed_dataset[f"{feature}_target"])
-            self.feature_dataframe[f"{feature}_difference_relative"] = relative_difference_numerical(
-                self.preprocessed_dataset[f"{feature}_source"], self.preprocessed_dataset[f"{feature}_target"])
-            self.feature_dataframe[f"{feature}_difference_normalized"] = normalized_difference_numerical(
-                self.preprocessed_dataset[f"{feature}_source"], self.preprocessed_dataset[f"{feature}_target"],
-                (self.preprocessed_dataset["number_punctuations_total_source"] + self.preprocessed_dataset[
-                    "number_words_source"]),
-                (self.preprocessed_dataset["number_punctuations_total_target"] + self.preprocessed_dataset[
-                    "number_words_target"]))
+        source_matrix = self.preprocessed_dataset[
+            [f"{feature}_source" for feature in self.feature_difference_list]].to_numpy(dtype=float)
+        target_matrix = self.preprocessed_dataset[
+            [f"{feature}_target" for feature in self.feature_difference_list]].to_numpy(dtype=float)
+        source_sentence_length = (self.preprocessed_dataset["number_punctuations_total_source"] +
+                                  self.preprocessed_dataset["number_words_source"]).to_numpy(dtype=float)
+        target_sentence_length = (self.preprocessed_dataset["number_punctuations_total_target"] +
+                                  self.preprocessed_dataset["number_words_target"]).to_numpy(dtype=float)
+
+        difference, relative_difference, normalized_difference = difference_features(
+            source_matrix, target_matrix, source_sentence_length, target_sentence_length)
+
+        # Interleave the three matrices to keep the column order difference, relative, normalized per feature.
+        sentence_features = np.stack((difference, relative_difference, normalized_difference), axis=2).reshape(
+            len(self.preprocessed_dataset), -1)
+        sentence_feature_columns = [f"{feature}_difference{suffix}" for feature in self.feature_difference_list
+                                    for suffix in ("", "_relative", "_normalized")]
+        self.feature_dataframe = pd.concat([self.feature_dataframe,
+                                            pd.DataFrame(sentence_features, index=self.feature_dataframe.index,
+                                                         columns=sentence_feature_columns)], axis=1)
 
         self.feature_dataframe["jaccard_numbers_source"] = jaccard(
             self.preprocessed_dataset[
@@ -55,3 +55,34 @@ def normalized_difference_numerical(source_array, target_array, source_sentence_
         np.nan, 0).replace(
         np.inf, 0).replace(
         np.log(0), 0)
+
+
+@timer
+def difference_features(source_matrix, target_matrix, source_sentence_length, target_sentence_length):
+    """ Function to generate the difference, relative difference and normalized difference of several feature
+        variables at once.
+
+        Args:
+            source_matrix (numpy.array): feature matrix describing source language, one column per feature.
+            target_matrix (numpy.array): feature matrix describing target language, one column per feature.
+            source_sentence_length (numpy.array): array describing the length of a feature sentence in source.
+            target_sentence_length (numpy.array): array describing the length of a feature sentence in target.
+
+        Returns:
+            numpy.array: Matrix containing the differences.
+            numpy.array: Matrix containing the relative differences.
+            numpy.array: Matrix containing the normalized differences.
+    """
+    source_matrix = np.asarray(source_matrix, dtype=float)
+    target_matrix = np.asarray(target_matrix, dtype=float)
+    source_sentence_length = np.asarray(source_sentence_length, dtype=float).reshape(-1, 1)
+    target_sentence_length = np.asarray(target_sentence_length, dtype=float).reshape(-1, 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        difference = np.abs(target_matrix - source_matrix)
+        relative_difference = difference / (source_matrix + target_matrix)
+        normalized_difference = np.abs((source_matrix / source_sentence_length) -
+                                       (target_matrix / target_sentence_length))
+
+    return tuple(np.nan_to_num(matrix, nan=0, posinf=0, neginf=0)
+                 for matrix in (difference, relative_difference, normalized_difference))
@@ -1,5 +1,11 @@
 """
+.. automodule:: src.utils.on_unique
+    :members:
+.. automodule:: src.utils.parallel
+    :members:
 .. automodule:: src.utils.timer
     :members:
 """
+from .on_unique import on_unique
+from .parallel import parallel_map
 from .timer import timer
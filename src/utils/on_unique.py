@@ -0,0 +1,45 @@
+""" Function to evaluate a function only on the unique entries of an array.
+"""
+
+import functools
+
+import pandas as pd
+
+
+def on_unique(function):
+    """ Function to evaluate a function only on the unique sentences of an array and expand the result afterwards.
+
+        Args:
+            function (function): Function whose first argument is an array of text and which returns an array, a
+                                 dataframe or a tuple of them with one row per sentence.
+
+        Returns:
+            result (object): Result of the function for every sentence of the original array.
+
+        Raises:
+            ValueError: If the array contains missing sentences.
+    """
+
+    @functools.wraps(function)
+    def unique_evaluation(sentence_vector, *args, **kwargs):
+        """ Function to evaluate the function on the unique sentences and to map the result back to all sentences.
+        """
+        codes, uniques = pd.factorize(sentence_vector)
+        # Missing sentences get the code -1, which would silently pick the result of another sentence.
+        if (codes < 0).any():
+            raise ValueError("The array contains missing sentences at index {}.".format(
+                list(sentence_vector.index[codes < 0])))
+        result = function(pd.Series(uniques), *args, **kwargs)
+
+        def expand(unique_result):
+            """ Repeat the rows of a unique result for every occurrence of the sentence.
+            """
+            expanded_result = unique_result.iloc[codes]
+            expanded_result.index = sentence_vector.index
+            return expanded_result
+
+        if isinstance(result, tuple):
+            return tuple(expand(unique_result) for unique_result in result)
+        return expand(result)
+
+    return unique_evaluation
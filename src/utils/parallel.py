@@ -0,0 +1,62 @@
+""" Function to evaluate a row-wise function on several processes.
+"""
+
+import functools
+import multiprocessing
+import os
+
+from tqdm import tqdm
+
+
+def available_cpus():
+    """ Function to count the CPUs this process may run on.
+
+        Respects the CPU affinity of the process and, on Linux, the CPU quota of the container (cgroup v2).
+
+        Returns:
+            int: Number of usable CPUs, at least one.
+    """
+    try:
+        n_cpu = len(os.sched_getaffinity(0))
+    except AttributeError:
+        n_cpu = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            n_cpu = min(n_cpu, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+    return max(1, n_cpu)
+
+
+# Leave one CPU to the parent process, which pickles the rows for the workers and collects their results.
+N_PROCESS = max(1, available_cpus() - 1)
+
+
+def apply_row(function, row):
+    """ Function to call a function with the entries of a row as positional arguments.
+    """
+    return function(*row)
+
+
+def parallel_map(function, *vectors, n_process=N_PROCESS, chunksize=1000):
+    """ Function to evaluate a row-wise function on several processes.
+
+        Args:
+            function (function): Module level function that is executed for every row, it has to be picklable.
+            vectors (array): Arrays whose rows are passed as positional arguments to the function, the first one
+                             determines the number of rows.
+            n_process (int): Number of worker processes, defaults to N_PROCESS.
+            chunksize (int): Number of rows that are sent to a worker at once.
+
+        Returns:
+            list: Results of the function in the order of the rows.
+    """
+    rows = zip(*vectors)
+    total = len(vectors[0])
+    if n_process <= 1:
+        # A single worker would only add the cost of pickling every row in the parent process.
+        return [function(*row) for row in tqdm(rows, total=total)]
+    with multiprocessing.Pool(n_process) as pool:
+        return list(tqdm(pool.imap(functools.partial(apply_row, function), rows, chunksize=chunksize), total=total))
@@ -0,0 +1,29 @@
+""" Test configuration.
+
+The wmd and pickle5 packages are only needed to compute word mover distances and to read pickles of protocol 5 with
+older pythons, but are imported when the src.data package is imported. If they are not installed, minimal stand-ins
+are registered so that the rest of the package can be tested.
+"""
+
+import importlib
+import pickle
+import sys
+import types
+
+
+def stand_in_word_mover_distance(*args, **kwargs):
+    """ Stand-in for wmd.WMD, which fails like a missing package once it is used.
+    """
+    raise ImportError("wmd is not installed")
+
+
+try:
+    importlib.import_module("wmd")
+except ImportError:
+    sys.modules["wmd"] = types.ModuleType("wmd")
+    sys.modules["wmd"].WMD = stand_in_word_mover_distance
+
+try:
+    importlib.import_module("pickle5")
+except ImportError:
+    sys.modules["pickle5"] = pickle
@@ -0,0 +1,33 @@
+""" Tests for the features based on crosslingual word embeddings.
+"""
+
+import numpy as np
+
+import src.data  # noqa: F401, imported first to resolve the import cycle between src.data and src.features
+from src.features import embedding_features
+
+
+class RecordingWMD:
+    """ Stand-in for wmd.WMD, which records its input and reports a fixed distance.
+    """
+    calls = []
+
+    def __init__(self, embeddings, nbow, vocabulary_min):
+        RecordingWMD.calls.append((embeddings, nbow))
+
+    def nearest_neighbors(self, origin, k):
+        return [("target", 0.25)]
+
+
+def test_word_mover_distance_uses_one_embedding_row_per_token(monkeypatch):
+    monkeypatch.setattr(embedding_features, "WMD", RecordingWMD)
+    source = (["a", "b", "c"], np.array([[1., 0.], [0., 1.], [1., 1.]], dtype=np.float32))
+    target = (["d"], np.array([[0.5, 0.5]], dtype=np.float32))
+
+    # Sentences with a different number of token are compared as well.
+    assert embedding_features.word_mover_distance(source, target) == 0.25
+
+    embeddings, nbow = RecordingWMD.calls[-1]
+    assert embeddings.shape == (4, 2)
+    assert nbow["source"][1].tolist() == [0, 1, 2]
+    assert nbow["target"][1].tolist() == [3]
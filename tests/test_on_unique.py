@@ -0,0 +1,20 @@
+""" Tests for the evaluation of functions on unique sentences.
+"""
+
+import pandas as pd
+import pytest
+
+from src.utils.on_unique import on_unique
+
+
+def test_on_unique_expands_results_to_all_sentences():
+    sentence_vector = pd.Series(["aa", "bbbb", "aa"], index=[3, 2, 1])
+    result = on_unique(lambda unique_vector: unique_vector.str.len())(sentence_vector)
+    assert result.tolist() == [2, 4, 2]
+    assert result.index.tolist() == [3, 2, 1]
+
+
+def test_on_unique_raises_on_missing_sentences():
+    sentence_vector = pd.Series(["aa", None, "bbbb", "aa"])
+    with pytest.raises(ValueError):
+        on_unique(lambda unique_vector: unique_vector.str.len())(sentence_vector)
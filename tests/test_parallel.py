@@ -0,0 +1,19 @@
+""" Tests for the evaluation of row-wise functions on several processes.
+"""
+
+import operator
+
+from src.utils.parallel import N_PROCESS, available_cpus, parallel_map
+
+
+def test_available_cpus_leaves_one_cpu_to_the_parent():
+    assert available_cpus() >= 1
+    assert N_PROCESS == max(1, available_cpus() - 1)
+
+
+def test_parallel_map_keeps_row_order():
+    first = list(range(50))
+    second = list(range(50, 100))
+    expected = [a + b for a, b in zip(first, second)]
+    assert parallel_map(operator.add, first, second, n_process=1) == expected
+    assert parallel_map(operator.add, first, second, n_process=2, chunksize=7) == expected
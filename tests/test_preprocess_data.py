@@ -0,0 +1,76 @@
+""" Tests for the functions to preprocess parallel sentence data.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data import preprocess_data
+from src.data.preprocess_data import number_words, number_unique_words, number_characters, \
+    number_punctuations_total, number_stopwords, number_punctuation_marks, word_embeddings, \
+    sentence_embedding_average, sentence_embedding_tf_idf, sentiment
+
+
+def test_count_features_on_token_lists():
+    sentence_vector = pd.Series([["a", "a", "b", ","], ["cc", "."]])
+    assert number_words(sentence_vector).tolist() == [3, 1]
+    assert number_unique_words(sentence_vector).tolist() == [2, 1]
+    assert number_characters(sentence_vector).tolist() == [3, 2]
+    assert number_punctuations_total(sentence_vector).tolist() == [1, 0]
+    assert number_stopwords(sentence_vector, ["a"]).tolist() == [2, 0]
+
+
+def test_number_punctuations_total_counts_ellipsis_but_not_end_of_sentence():
+    sentence_vector = pd.Series([["a", "...", "b", "."]])
+    assert number_punctuations_total(sentence_vector).tolist() == [1]
+
+
+def test_number_punctuation_marks_on_token_lists():
+    sentence_vector = pd.Series([["a", ",", ",", "!"], ["b"]], index=[5, 7])
+    result = number_punctuation_marks(sentence_vector, ",")
+    assert result.tolist() == [2, 0]
+    assert result.index.tolist() == [5, 7]
+
+
+def test_sentence_embeddings_keep_token_aligned_with_embedding_rows():
+    embedding_array = np.array([[1., 0.], [0., 1.], [1., 1.]], dtype=np.float32)
+    embedding_dictionary = {"a": 0, "b": 1, "c": 2}
+    token_vector = pd.Series([["b", "x", "a", "b"], ["x"]])
+    embedding_token_vector = word_embeddings(token_vector, embedding_array, embedding_dictionary)
+
+    token_list, embedding_matrix = embedding_token_vector[0]
+    assert token_list == ["b", "a"]
+    assert embedding_matrix.tolist() == [[0., 1.], [1., 0.]]
+
+    average = sentence_embedding_average(embedding_token_vector)
+    assert average[0][0].tolist() == [0.5, 0.5]
+    assert average[1][0].empty
+
+    tf_idf_dict_vec = np.array([{"a": 0.2, "b": 0.6, "x": 0.2}, {"x": 1.}])
+    weighted_average = sentence_embedding_tf_idf(embedding_token_vector, tf_idf_dict_vec)
+    assert np.allclose(weighted_average[0][0].tolist(), [0.1, 0.3])
+    assert weighted_average[1][0].empty
+
+
+def test_sentence_embeddings_of_float16_embeddings_are_float32():
+    embedding_array = np.array([[1., 0.], [0., 1.]], dtype=np.float16)
+    embedding_token_vector = word_embeddings(pd.Series([["a", "b"]]), embedding_array, {"a": 0, "b": 1})
+    assert embedding_token_vector[0][1].dtype == np.float32
+    assert sentence_embedding_average(embedding_token_vector)[0][0].dtype == np.float32
+
+
+class StubTextBlob:
+    """ Stand-in for a TextBlob class, whose sentiment depends only on the length of the sentence.
+    """
+
+    def __init__(self, sentence):
+        self.sentiment = (len(sentence) / 10, 0.5)
+
+
+def test_sentiment_of_duplicated_sentences_on_several_processes(monkeypatch):
+    monkeypatch.setattr(preprocess_data, "N_PROCESS", 2)
+    sentence_vector = pd.Series(["good", "very bad", "good"], index=[4, 2, 9])
+    result = sentiment(sentence_vector, StubTextBlob)
+    assert result.columns.tolist() == ["polarity", "subjectivity"]
+    assert result.index.tolist() == [4, 2, 9]
+    assert result["polarity"].tolist() == [0.4, 0.8, 0.4]
+    assert result["subjectivity"].tolist() == [0.5, 0.5, 0.5]